@@ -68,10 +68,10 @@ class EquivalenceLibrary():
         equiv = Equivalence(params=gate.params.copy(),
                             circuit=equivalent_circuit.copy())
 
-        if key not in self._map:
-            self._map[key] = Entry(search_base=True, equivalences=[])
-
-        self._map[key].equivalences.append(equiv)
+        if key in self._map:
+            self._map[key].equivalences.append(equiv)
+        else:
+            self._map[key] = Entry(search_base=True, equivalences=[equiv])
 
     def set_entry(self, gate, entry):
         """Set the equivalence record for a Gate. Future queries for the Gate
@@ -167,6 +167,10 @@ def _raise_if_shape_mismatch(gate, circuit):
 def _rebind_equiv(equiv, query_params):
     equiv_params, equiv_circuit = equiv
 
+    if not equiv_params:
+        # Nothing to rebind, e.g. for HGate or CXGate; only a copy is needed.
+        return equiv_circuit.copy()
+
     param_map = dict(zip(equiv_params, query_params))
     equiv = equiv_circuit.assign_parameters(param_map, inplace=False)
 
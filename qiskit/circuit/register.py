@@ -130,8 +130,9 @@ class Register:
             return self._bits[key]
 
     def __iter__(self):
-        for bit in range(self._size):
-            yield self[bit]
+        # Iterate the bit list directly rather than through __getitem__,
+        # as QuantumCircuit rebuilds its bit lists from this on every append.
+        yield from self._bits[:self._size]
 
     def __eq__(self, other):
         """Two Registers are the same if they are of the same type
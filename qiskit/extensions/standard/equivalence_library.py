@@ -91,13 +91,15 @@ _sel.add_equivalence(CHGate(), def_ch)
 
 # MSGate
 
+theta = Parameter('theta')
 for num_qubits in range(2, 20):
     q = QuantumRegister(num_qubits, 'q')
-    theta = Parameter('theta')
     def_ms = QuantumCircuit(q)
+    # The qargs are known-valid pairs of distinct qubits of q, so skip the
+    # argument expansion of append, which is linear in the circuit width.
     for i in range(num_qubits):
         for j in range(i + 1, num_qubits):
-            def_ms.append(RXXGate(theta), [q[i], q[j]])
+            def_ms._append(RXXGate(theta), [q[i], q[j]], [])
     _sel.add_equivalence(MSGate(num_qubits, theta), def_ms)
 
 # RGate
@@ -426,13 +428,14 @@ _sel.add_equivalence(U2Gate(phi, lam), def_u2)
 
 q = QuantumRegister(2, 'q')
 theta = Parameter('theta')
+half_theta = theta / 2
 def_cu1 = QuantumCircuit(q)
 for inst, qargs, cargs in [
-        (U1Gate(theta / 2), [q[0]], []),
+        (U1Gate(half_theta), [q[0]], []),
         (CXGate(), [q[0], q[1]], []),
-        (U1Gate(-theta / 2), [q[1]], []),
+        (U1Gate(-half_theta), [q[1]], []),
         (CXGate(), [q[0], q[1]], []),
-        (U1Gate(theta / 2), [q[1]], [])
+        (U1Gate(half_theta), [q[1]], [])
 ]:
     def_cu1.append(inst, qargs, cargs)
 _sel.add_equivalence(CU1Gate(theta), def_cu1)
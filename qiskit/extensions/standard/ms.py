@@ -42,16 +42,11 @@ class MSGate(Gate):
 
     def _define(self):
         from qiskit.extensions.standard.rxx import RXXGate
-        definition = []
         q = QuantumRegister(self.num_qubits, 'q')
-        rule = []
-        for i in range(self.num_qubits):
-            for j in range(i + 1, self.num_qubits):
-                rule += [(RXXGate(self.params[0]), [q[i], q[j]], [])]
-
-        for inst in rule:
-            definition.append(inst)
-        self.definition = definition
+        theta = self.params[0]
+        self.definition = [(RXXGate(theta), [q[i], q[j]], [])
+                           for i in range(self.num_qubits)
+                           for j in range(i + 1, self.num_qubits)]
 
 
 def ms(self, theta, qubits):
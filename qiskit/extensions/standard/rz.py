@@ -19,6 +19,8 @@ from qiskit.circuit import Gate
 from qiskit.circuit import ControlledGate
 from qiskit.circuit import QuantumCircuit
 from qiskit.circuit import QuantumRegister
+from qiskit.extensions.standard.u1 import U1Gate
+from qiskit.extensions.standard.x import CXGate
 from qiskit.util import deprecate_arguments
 
 
@@ -66,15 +68,10 @@ class RZGate(Gate):
         """
         gate rz(phi) a { u1(phi) a; }
         """
-        from qiskit.extensions.standard.u1 import U1Gate
-        definition = []
         q = QuantumRegister(1, 'q')
-        rule = [
+        self.definition = [
             (U1Gate(self.params[0]), [q[0]], [])
         ]
-        for inst in rule:
-            definition.append(inst)
-        self.definition = definition
 
     def control(self, num_ctrl_qubits=1, label=None, ctrl_state=None):
         """Return a (mutli-)controlled-RZ gate.
@@ -201,19 +198,14 @@ class CRZGate(ControlledGate, metaclass=CRZMeta):
           u1(-lambda/2) b; cx a,b;
         }
         """
-        from qiskit.extensions.standard.u1 import U1Gate
-        from qiskit.extensions.standard.x import CXGate
-        definition = []
         q = QuantumRegister(2, 'q')
-        rule = [
-            (U1Gate(self.params[0] / 2), [q[1]], []),
+        half_lam = self.params[0] / 2
+        self.definition = [
+            (U1Gate(half_lam), [q[1]], []),
             (CXGate(), [q[0], q[1]], []),
-            (U1Gate(-self.params[0] / 2), [q[1]], []),
+            (U1Gate(-half_lam), [q[1]], []),
             (CXGate(), [q[0], q[1]], [])
         ]
-        for inst in rule:
-            definition.append(inst)
-        self.definition = definition
 
     def inverse(self):
         """Return inverse RZ gate (i.e. with the negative rotation angle)."""
@@ -57,7 +57,7 @@ class CommutativeCancellation(TransformationPass):
         q_gate_list = ['cx', 'cy', 'cz', 'h', 'y']
 
         # Gate sets to be cancelled
-        cancellation_sets = defaultdict(lambda: [])
+        cancellation_sets = defaultdict(list)
 
         # Traverse each qubit to generate the cancel dictionaries
         # Cancel dictionaries:
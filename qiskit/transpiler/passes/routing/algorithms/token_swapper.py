@@ -30,7 +30,7 @@
 
 import logging
 from typing import TypeVar, Iterator, Mapping, Generic, MutableMapping, MutableSet, List, \
-    Iterable, Optional, Union
+    Iterable, Optional, Union, Dict, Tuple
 
 import networkx as nx
 import numpy as np
@@ -62,7 +62,15 @@ class ApproximateTokenSwapper(Generic[_V]):
         # The nodes in graph don't have to integer nor contiguous, but those in a NumPy array are.
         nodelist = list(graph.nodes())
         self.node_map = {node: i for i, node in enumerate(nodelist)}
-        self.shortest_paths = nx.floyd_warshall_numpy(graph, nodelist=nodelist)
+        # Neighbor lists are read on every swap, so avoid going through the graph views.
+        self._neighbors = {node: tuple(graph.neighbors(node))
+                           for node in nodelist}  # type: Dict[_V, Tuple[_V, ...]]
+        # floyd_warshall_numpy returns an np.matrix, whose scalar indexing is much slower
+        # than that of a plain ndarray.
+        self.shortest_paths = np.asarray(nx.floyd_warshall_numpy(graph, nodelist=nodelist))
+        # Lazily filled cache of the neighbors of a node that are closer to a destination,
+        # keyed by (node, destination). The graph is fixed, so it is shared by all map calls.
+        self._closer_neighbors = {}  # type: Dict[Tuple[_V, _V], Tuple[_V, ...]]
         if isinstance(seed, np.random.RandomState):
             self.seed = seed
         else:
@@ -103,37 +111,39 @@ class ApproximateTokenSwapper(Generic[_V]):
 
         Returns:
           The swaps to implement the mapping
+
+        Raises:
+          ValueError: if `trials` is less than 1.
         """
+        if trials < 1:
+            raise ValueError("At least one trial is needed to map the tokens, got %s." % trials)
         tokens = dict(mapping)
-        digraph = nx.DiGraph()
-        sub_digraph = nx.DiGraph()  # Excludes self-loops in digraph.
-        todo_nodes = {node for node, destination in tokens.items() if node != destination}
-        for node in self.graph.nodes:
-            self._add_token_edges(node, tokens, digraph, sub_digraph)
-
-        trial_results = iter(list(self._trial_map(digraph.copy(),
-                                                  sub_digraph.copy(),
-                                                  todo_nodes.copy(),
-                                                  tokens.copy()))
-                             for _ in range(trials))
-
-        # Once we find a zero solution we stop.
-        def take_until_zero(results: Iterable[List[_T]]) -> Iterator[List[_T]]:
-            """Take results until one is emitted of length zero (and also emit that)."""
-            for result in results:
-                yield result
-                if not result:
-                    break
-
-        trial_results = take_until_zero(trial_results)
-        return min(trial_results, key=len)
+        # The digraph is stored as a mapping from nodes to their successors. The successor
+        # tuples are immutable, so each trial only needs a shallow copy of this mapping.
+        # The self-loops of tokens that are already home are left implicit.
+        digraph = {}  # type: Dict[_V, Tuple[_V, ...]]
+        todo_nodes = _IndexedSet(node for node, destination in tokens.items()
+                                 if node != destination)
+        # Only tokens that are not home yet have edges.
+        for node in todo_nodes:
+            self._add_token_edges(node, tokens, digraph)
+
+        best_result = self._trial_map(digraph.copy(), todo_nodes.copy(), tokens.copy())
+        for _ in range(trials - 1):
+            # Once we find a zero solution we stop.
+            if not best_result:
+                break
+            result = self._trial_map(digraph.copy(), todo_nodes.copy(), tokens.copy())
+            if len(result) < len(best_result):
+                best_result = result
+        return best_result
 
     def _trial_map(self,
-                   digraph: nx.DiGraph,
-                   sub_digraph: nx.DiGraph,
-                   todo_nodes: MutableSet[_V],
-                   tokens: MutableMapping[_V, _V]) -> Iterator[Swap[_V]]:
+                   digraph: MutableMapping[_V, Tuple[_V, ...]],
+                   todo_nodes: '_IndexedSet[_V]',
+                   tokens: MutableMapping[_V, _V]) -> List[Swap[_V]]:
         """Try to map the tokens to their destinations and minimize the number of swaps."""
+        swaps = []  # type: List[Swap[_V]]
 
         def swap(node0: _V, node1: _V) -> None:
             """Swap two nodes, maintaining datastructures.
@@ -145,79 +155,90 @@ class ApproximateTokenSwapper(Generic[_V]):
             Returns:
 
             """
-            self._swap(node0, node1, tokens, digraph, sub_digraph, todo_nodes)
+            self._swap(node0, node1, tokens, digraph, todo_nodes)
 
         # Can't just iterate over todo_nodes, since it may change during iteration.
         steps = 0
-        while todo_nodes and steps <= 4 * self.graph.number_of_nodes() ** 2:
+        max_steps = 4 * self.graph.number_of_nodes() ** 2
+        while todo_nodes and steps <= max_steps:
             todo_node_id = self.seed.randint(0, len(todo_nodes))
-            todo_node = tuple(todo_nodes)[todo_node_id]
+            todo_node = todo_nodes[todo_node_id]
 
-            # Try to find a happy swap chain first by searching for a cycle,
-            # excluding self-loops.
+            # Try to find a happy swap chain first by searching for a cycle.
             # Note that if there are only unhappy swaps involving this todo_node,
             # then an unhappy swap must be performed at some point.
             # So it is not useful to globally search for all happy swap chains first.
-            try:
-                cycle = nx.find_cycle(sub_digraph, source=todo_node)
+            cycle = _find_cycle(digraph, todo_node)
+            if cycle:
                 assert len(cycle) > 1, "The cycle was not happy."
                 # We iterate over the cycle in reversed order, starting at the last edge.
                 # The first edge is excluded.
                 for edge in cycle[-1:0:-1]:
-                    yield edge
+                    swaps.append(edge)
                     swap(edge[0], edge[1])
                 steps += len(cycle) - 1
-            except nx.NetworkXNoCycle:
+            else:
                 # Try to find a node without a token to swap with.
-                try:
-                    edge = next(edge for edge in nx.dfs_edges(sub_digraph, todo_node)
-                                if edge[1] not in tokens)
-                    # Swap predecessor and successor, because successor does not have a token
-                    yield edge
-                    swap(edge[0], edge[1])
-                    steps += 1
-                except StopIteration:
+                # The same search finds the node for the unhappy swap case: the first node
+                # visited whose token is home. It is where a search for a cycle including
+                # self-loops would end up, since all nodes visited before it have a
+                # token that is not home.
+                unhappy_node = None  # type: Optional[_V]
+                for edge in _dfs_edges(digraph, todo_node):
+                    if edge[1] not in tokens:
+                        # Swap predecessor and successor, because successor does not have a token
+                        swaps.append(edge)
+                        swap(edge[0], edge[1])
+                        steps += 1
+                        break
+                    if unhappy_node is None and tokens[edge[1]] == edge[1]:
+                        unhappy_node = edge[1]
+                else:
                     # Unhappy swap case
-                    cycle = nx.find_cycle(digraph, source=todo_node)
-                    assert len(cycle) == 1, "The cycle was not unhappy."
-                    unhappy_node = cycle[0][0]
+                    assert unhappy_node is not None, "No unhappy swap was found."
                     # Find a node that wants to swap with this node.
+                    # Only neighbors in the graph can have an edge to it.
                     try:
                         predecessor = next(
-                            predecessor for predecessor in digraph.predecessors(unhappy_node)
-                            if predecessor != unhappy_node)
+                            predecessor for predecessor in self._neighbors[unhappy_node]
+                            if unhappy_node in digraph.get(predecessor, ()))
                     except StopIteration:
                         logger.error("Unexpected StopIteration raised when getting predecessors"
                                      "in unhappy swap case.")
-                        return
-                    yield unhappy_node, predecessor
+                        return swaps
+                    swaps.append((unhappy_node, predecessor))
                     swap(unhappy_node, predecessor)
                     steps += 1
         if todo_nodes:
             raise RuntimeError("Too many iterations while approximating the Token Swaps.")
+        return swaps
 
     def _add_token_edges(self,
                          node: _V,
                          tokens: Mapping[_V, _V],
-                         digraph: nx.DiGraph,
-                         sub_digraph: nx.DiGraph) -> None:
+                         digraph: MutableMapping[_V, Tuple[_V, ...]]) -> None:
         """Add diedges to the graph wherever a token can be moved closer to its destination."""
         if node not in tokens:
             return
 
-        if tokens[node] == node:
-            digraph.add_edge(node, node)
+        destination = tokens[node]
+        if destination == node:
             return
 
-        for neighbor in self.graph.neighbors(node):
-            if self.distance(neighbor, tokens[node]) < self.distance(node, tokens[node]):
-                digraph.add_edge(node, neighbor)
-                sub_digraph.add_edge(node, neighbor)
+        successors = self._closer_neighbors.get((node, destination))
+        if successors is None:
+            # Index shortest_paths directly, since this is evaluated for every neighbor.
+            distances = self.shortest_paths[:, self.node_map[destination]]
+            node_distance = distances[self.node_map[node]]
+            successors = tuple(neighbor for neighbor in self._neighbors[node]
+                               if distances[self.node_map[neighbor]] < node_distance)
+            self._closer_neighbors[node, destination] = successors
+        if successors:
+            digraph[node] = successors
 
     def _swap(self, node1: _V, node2: _V,
               tokens: MutableMapping[_V, _V],
-              digraph: nx.DiGraph,
-              sub_digraph: nx.DiGraph,
+              digraph: MutableMapping[_V, Tuple[_V, ...]],
               todo_nodes: MutableSet[_V]) -> None:
         """Swap two nodes, maintaining the data structures."""
         assert self.graph.has_edge(node1,
@@ -231,11 +252,106 @@ class ApproximateTokenSwapper(Generic[_V]):
             tokens[node2] = token1
         # Recompute the edges incident to node 1 and 2
         for node in [node1, node2]:
-            digraph.remove_edges_from([(node, successor) for successor in digraph.successors(node)])
-            sub_digraph.remove_edges_from(
-                [(node, successor) for successor in sub_digraph.successors(node)])
-            self._add_token_edges(node, tokens, digraph, sub_digraph)
+            digraph.pop(node, None)
+            self._add_token_edges(node, tokens, digraph)
             if node in tokens and tokens[node] != node:
                 todo_nodes.add(node)
-            elif node in todo_nodes:
-                todo_nodes.remove(node)
+            else:
+                todo_nodes.discard(node)
+
+
+def _find_cycle(successors: Mapping[_V, Tuple[_V, ...]], source: _V) -> List[Swap[_V]]:
+    """Find a cycle reachable from `source` in a digraph given by its successors.
+
+    Successors are explored depth-first in order, as in :func:`networkx.find_cycle`, so the
+    same cycle is found.
+
+    Returns:
+        The edges of the cycle, starting from the first node of the cycle that was visited.
+        Empty if there is no cycle reachable from `source`.
+    """
+    path = [source]
+    path_index = {source: 0}  # type: Dict[_V, int]
+    finished = set()  # type: MutableSet[_V]
+    stack = [iter(successors.get(source, ()))]
+    while stack:
+        for successor in stack[-1]:
+            if successor in path_index:
+                cycle = path[path_index[successor]:]
+                return list(zip(cycle, cycle[1:] + [successor]))
+            if successor not in finished:
+                path_index[successor] = len(path)
+                path.append(successor)
+                stack.append(iter(successors.get(successor, ())))
+                break
+        else:
+            stack.pop()
+            node = path.pop()
+            del path_index[node]
+            finished.add(node)
+    return []
+
+
+def _dfs_edges(successors: Mapping[_V, Tuple[_V, ...]], source: _V) -> Iterator[Swap[_V]]:
+    """Iterate over the edges of a depth-first search tree from `source`.
+
+    Equivalent to :func:`networkx.dfs_edges` for a digraph given by its successors.
+    """
+    visited = {source}
+    stack = [(source, iter(successors.get(source, ())))]
+    while stack:
+        parent, children = stack[-1]
+        for child in children:
+            if child not in visited:
+                yield parent, child
+                visited.add(child)
+                stack.append((child, iter(successors.get(child, ()))))
+                break
+        else:
+            stack.pop()
+
+
+class _IndexedSet(MutableSet[_T]):
+    """A set that also supports selecting an element by index in constant time.
+
+    Removing an element moves the last element into its slot, so indices are not stable.
+    """
+
+    def __init__(self, elements: Iterable[_T] = ()) -> None:
+        self._elements = []  # type: List[_T]
+        self._indices = {}  # type: Dict[_T, int]
+        for element in elements:
+            self.add(element)
+
+    def __contains__(self, element: object) -> bool:
+        return element in self._indices
+
+    def __iter__(self) -> Iterator[_T]:
+        return iter(self._elements)
+
+    def __len__(self) -> int:
+        return len(self._elements)
+
+    def __getitem__(self, index: int) -> _T:
+        return self._elements[index]
+
+    def add(self, element: _T) -> None:
+        if element not in self._indices:
+            self._indices[element] = len(self._elements)
+            self._elements.append(element)
+
+    def discard(self, element: _T) -> None:
+        index = self._indices.pop(element, None)
+        if index is None:
+            return
+        last = self._elements.pop()
+        if index < len(self._elements):
+            self._elements[index] = last
+            self._indices[last] = index
+
+    def copy(self) -> '_IndexedSet[_T]':
+        """Return a shallow copy of this set."""
+        copied = _IndexedSet()  # type: _IndexedSet[_T]
+        copied._elements = self._elements.copy()
+        copied._indices = self._indices.copy()
+        return copied
@@ -34,6 +34,8 @@ import networkx as nx
 from numpy import random
 from qiskit.transpiler.passes.routing.algorithms import ApproximateTokenSwapper
 from qiskit.transpiler.passes.routing.algorithms import util
+from qiskit.transpiler.passes.routing.algorithms.token_swapper import _IndexedSet, \
+    _find_cycle, _dfs_edges
 
 from qiskit.test import QiskitTestCase
 
@@ -99,6 +101,14 @@ class TestGeneral(QiskitTestCase):
         util.swap_permutation([out], permutation, allow_missing_keys=True)
         self.assertEqual({i: i for i in permutation.values()}, permutation)
 
+    def test_no_trials(self) -> None:
+        """Test that mapping with no trials raises instead of returning no swaps."""
+        graph = nx.path_graph(4)
+        swapper = ApproximateTokenSwapper(graph)  # type: ApproximateTokenSwapper[int]
+
+        with self.assertRaises(ValueError):
+            swapper.map({0: 3}, trials=0)
+
     def test_large_partial_random(self) -> None:
         """Test a random (partial) mapping on a large randomly generated graph"""
         size = 100
@@ -118,3 +128,107 @@ class TestGeneral(QiskitTestCase):
         out = list(swapper.map(mapping, trials=40))
         util.swap_permutation([out], mapping, allow_missing_keys=True)
         self.assertEqual({i: i for i in mapping.values()}, mapping)
+
+
+class TestDigraphSearch(QiskitTestCase):
+    """Test the digraph searches of the token swapper against their NetworkX counterparts."""
+
+    def assertSearchesMatchNetworkx(self, digraph: nx.DiGraph, source: int) -> None:
+        """Check the cycle and DFS edges found from `source` are those NetworkX finds."""
+        successors = {node: tuple(digraph.successors(node)) for node in digraph}
+        try:
+            expected_cycle = nx.find_cycle(digraph, source=source)
+        except nx.NetworkXNoCycle:
+            expected_cycle = []
+        self.assertEqual(expected_cycle, _find_cycle(successors, source))
+        self.assertEqual(list(nx.dfs_edges(digraph, source)),
+                         list(_dfs_edges(successors, source)))
+
+    def test_no_cycle(self) -> None:
+        """Test a digraph without cycles."""
+        self.assertSearchesMatchNetworkx(nx.DiGraph([(0, 1), (1, 2), (0, 3), (3, 2)]), 0)
+        self.assertEqual([], _find_cycle({0: (1,), 1: (2,)}, 0))
+
+    def test_cycle_through_source(self) -> None:
+        """Test a cycle that contains the source."""
+        self.assertSearchesMatchNetworkx(nx.DiGraph([(0, 1), (1, 2), (2, 0)]), 0)
+        self.assertEqual([(0, 1), (1, 2), (2, 0)], _find_cycle({0: (1,), 1: (2,), 2: (0,)}, 0))
+
+    def test_cycle_not_through_source(self) -> None:
+        """Test a cycle that is reachable from, but does not contain, the source."""
+        self.assertSearchesMatchNetworkx(nx.DiGraph([(0, 1), (1, 2), (2, 3), (3, 1)]), 0)
+        self.assertEqual([(1, 2), (2, 3), (3, 1)],
+                         _find_cycle({0: (1,), 1: (2,), 2: (3,), 3: (1,)}, 0))
+
+    def test_revisit_finished_node(self) -> None:
+        """Test that reaching a fully explored node again is not a cycle."""
+        # Nodes 1 and 2, and the descendant 3 of 2, are finished when they are reached
+        # again through 4.
+        successors = {0: (1, 4), 1: (2,), 2: (3,), 4: (2, 1)}
+        self.assertEqual([], _find_cycle(successors, 0))
+        self.assertEqual([(0, 1), (1, 2), (2, 3), (0, 4)], list(_dfs_edges(successors, 0)))
+        self.assertSearchesMatchNetworkx(
+            nx.DiGraph([(0, 1), (1, 2), (2, 3), (0, 4), (4, 2), (4, 1)]), 0)
+        # As above, but with a cycle found only after revisiting 2.
+        self.assertSearchesMatchNetworkx(
+            nx.DiGraph([(0, 1), (1, 2), (0, 3), (3, 2), (3, 4), (4, 3)]), 0)
+
+    def test_random_digraphs(self) -> None:
+        """Test random small digraphs, including self-loops."""
+        rng = random.RandomState(1)
+        for _ in range(200):
+            digraph = nx.gnm_random_graph(6, rng.randint(0, 15), seed=rng.randint(2 ** 31),
+                                          directed=True)
+            digraph.add_edges_from((node, node) for node in digraph if rng.rand() < 0.1)
+            self.assertSearchesMatchNetworkx(digraph, rng.randint(6))
+
+
+class TestIndexedSet(QiskitTestCase):
+    """Test cases for the indexed set of nodes that still need to be mapped."""
+
+    def test_discard_last(self) -> None:
+        """Test discarding the element at the last index."""
+        items = _IndexedSet('abc')
+        items.discard('c')
+        self.assertEqual(['a', 'b'], list(items))
+        self.assertNotIn('c', items)
+        self.assertEqual(2, len(items))
+
+    def test_discard_middle(self) -> None:
+        """Test that discarding an element moves the last element into its index."""
+        items = _IndexedSet('abcd')
+        items.discard('b')
+        self.assertEqual(['a', 'd', 'c'], list(items))
+        self.assertEqual('d', items[1])
+        # The moved element must be discardable at its new index.
+        items.discard('d')
+        self.assertEqual(['a', 'c'], list(items))
+        items.add('b')
+        self.assertEqual(['a', 'c', 'b'], list(items))
+
+    def test_discard_missing(self) -> None:
+        """Test that discarding a missing element does nothing, but removing it raises."""
+        items = _IndexedSet('ab')
+        items.discard('z')
+        self.assertEqual(['a', 'b'], list(items))
+        with self.assertRaises(KeyError):
+            items.remove('z')
+
+    def test_add_existing(self) -> None:
+        """Test that adding an existing element keeps a single copy at its index."""
+        items = _IndexedSet('ab')
+        items.add('a')
+        self.assertEqual(['a', 'b'], list(items))
+
+    def test_copy_independent(self) -> None:
+        """Test that a copy is not affected by changes to the original and vice versa."""
+        items = _IndexedSet('abc')
+        copied = items.copy()
+        items.discard('a')
+        copied.add('d')
+        self.assertEqual(['c', 'b'], list(items))
+        self.assertEqual(['a', 'b', 'c', 'd'], list(copied))
+        self.assertNotIn('d', items)
+        self.assertIn('a', copied)
+        copied.discard('b')
+        self.assertEqual('b', items[1])